@@ -44,17 +44,27 @@ def get_metrics(dirname):
             exec_lats.append(float(l[1]))
             commit_lats.append(float(l[2]))
 
+    # Convert the samples to arrays once and compute all percentiles of each in
+    # a single pass, rather than converting and partitioning the lists again
+    # for every percentile.
+    commit_lats = np.array(commit_lats, dtype=np.float64)
+    exec_lats = np.array(exec_lats, dtype=np.float64)
+    p50_commit, p90_commit, p95_commit, p99_commit = np.percentile(commit_lats,
+        [50, 90, 95, 99])
+    p50_exec, p90_exec, p95_exec, p99_exec = np.percentile(exec_lats,
+        [50, 90, 95, 99])
+
     return {
-        'mean_lat_commit': statistics.mean(commit_lats),
-        'p50_lat_commit': np.percentile(commit_lats, 50),
-        'p90_lat_commit': np.percentile(commit_lats, 90),
-        'p95_lat_commit': np.percentile(commit_lats, 95),
-        'p99_lat_commit': np.percentile(commit_lats, 99),
-        'mean_lat_exec': statistics.mean(exec_lats),
-        'p50_lat_exec': np.percentile(exec_lats, 50),
-        'p90_lat_exec': np.percentile(exec_lats, 90),
-        'p95_lat_exec': np.percentile(exec_lats, 95),
-        'p99_lat_exec': np.percentile(exec_lats, 99),
+        'mean_lat_commit': float(commit_lats.mean()),
+        'p50_lat_commit': float(p50_commit),
+        'p90_lat_commit': float(p90_commit),
+        'p95_lat_commit': float(p95_commit),
+        'p99_lat_commit': float(p99_commit),
+        'mean_lat_exec': float(exec_lats.mean()),
+        'p50_lat_exec': float(p50_exec),
+        'p90_lat_exec': float(p90_exec),
+        'p95_lat_exec': float(p95_exec),
+        'p99_lat_exec': float(p99_exec),
         'avg_tput': statistics.mean(tputs),
         'total_ops': len(exec_lats),
     }
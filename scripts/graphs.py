@@ -18,26 +18,45 @@
 This file contains code that plots the graphs in the "EPaxos Revisited" paper.
 """
 
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib
 from matplotlib import lines, patches, ticker
 import matplotlib.pyplot as plt
 import numpy as np
+import os
 from os import path
 import statistics
 from tabulate import tabulate
 
-from experiment import Experiment, CLOCK_SYNC_NONE, CLOCK_SYNC_QUORUM, \
-    CLOCK_SYNC_QUORUM_UNION, CLOCK_SYNC_CLUSTER
+from experiment import Experiment, EPAXOS_PROTO, MPAXOS_PROTO, \
+    CLOCK_SYNC_NONE, CLOCK_SYNC_QUORUM, CLOCK_SYNC_QUORUM_UNION, \
+    CLOCK_SYNC_CLUSTER
 from results import Results
 import utils
 
+# fast_histogram is an optional speedup for CDFs; np.histogram is used if it
+# isn't installed.
+try:
+    import fast_histogram
+except ImportError:
+    fast_histogram = None
+
 # The list of client locations, in the same order as the original EPaxos paper
 ORDERED_LOCS = ['va', 'ca', 'or', 'jp', 'eu']
+# Tick labels and positions for bar graphs over ORDERED_LOCS
+ORDERED_LOCS_UPPER = tuple(l.upper() for l in ORDERED_LOCS)
+_XPOS = np.arange(len(ORDERED_LOCS))
 # A color to use when differentiating from the default EPaxos Zipfian experiment
 ALTERNATE_ZIPF_COLOR = '#DA70D6' # Light purple
 # Fill patterns in a consistent order
 HATCHES = [None, '//', None]# TODO: revert!! '.']
 
+# The file format for saved graphs. savefig renders by file extension, so
+# setting EPAXOS_FIG_EXT=png while iterating on graphs skips the slower PDF
+# output; the default PDF output is for publication.
+FIG_EXT = os.environ.get('EPAXOS_FIG_EXT', 'pdf')
+
 # Set a consistent font for all graphs
 matplotlib.rc('font',**{'family':'sans-serif','sans-serif':['Helvetica']})
 plt.rcParams['pdf.fonttype'] = 42
@@ -62,13 +81,37 @@ def is_fixed_epaxos_result(r, perc_conflict):
         isinstance(r.workload(), Experiment.FixedConflictWorkload) and \
         r.workload().perc_conflict() == perc_conflict
 
-def get_fixed_epaxos_result(results, perc_conflict):
+def result_kind(r):
     """
-    Returns a Results object from the 'results' list in which the protocol was
-    EPaxos and the workload fixed at the percentage provided by 'perc_conflict'.
+    Returns a key describing the kind of experiment the Results object 'r'
+    contains: the protocol and, for EPaxos, the workload (and its conflict
+    percentage if fixed). Returns None if the experiment is none of these kinds.
     """
-    return list(filter(lambda r: is_fixed_epaxos_result(r, perc_conflict),
-        results))
+    if r.is_mpaxos(): return (MPAXOS_PROTO,)
+    if is_epaxos_zipf_result(r): return (EPAXOS_PROTO, 'zipf')
+    if r.is_epaxos() and isinstance(r.workload(),
+        Experiment.FixedConflictWorkload):
+        return (EPAXOS_PROTO, 'fixed', r.workload().perc_conflict())
+    return None
+
+def classify_results(results):
+    """
+    Groups the 'results' list by result_kind in a single pass, and returns a
+    dictionary from each kind to the list of Results objects of that kind. The
+    get_*_result functions below look up experiments in this dictionary.
+    """
+    table = defaultdict(list)
+    for r in results:
+        table[result_kind(r)].append(r)
+    return table
+
+def get_fixed_epaxos_result(table, perc_conflict):
+    """
+    Returns the Results objects from 'table', as returned by classify_results,
+    in which the protocol was EPaxos and the workload fixed at the percentage
+    provided by 'perc_conflict'.
+    """
+    return table.get((EPAXOS_PROTO, 'fixed', perc_conflict), [])
 
 def is_epaxos_zipf_result(r):
     """
@@ -78,19 +121,19 @@ def is_epaxos_zipf_result(r):
     return r.is_epaxos() and isinstance(r.workload(),
         Experiment.ZipfianWorkload)
 
-def get_epaxos_zipf_result(results):
+def get_epaxos_zipf_result(table):
     """
-    Returns a Results object from the 'results' list in which the protocol was
-    EPaxos and the workload was Zipfian.
+    Returns the Results objects from 'table', as returned by classify_results,
+    in which the protocol was EPaxos and the workload was Zipfian.
     """
-    return list(filter(is_epaxos_zipf_result, results))
+    return table.get((EPAXOS_PROTO, 'zipf'), [])
 
-def get_mpaxos_result(results):
+def get_mpaxos_result(table):
     """
-    Returns a Results object from the 'results' list in which the protocol was
-    Multi-Paxos.
+    Returns the Results objects from 'table', as returned by classify_results,
+    in which the protocol was Multi-Paxos.
     """
-    return list(filter(lambda r: r.is_mpaxos(), results))
+    return table.get((MPAXOS_PROTO,), [])
 
 def legend_line(color, linestyle='-'):
     """
@@ -136,9 +179,23 @@ def plot_cdf(ax, data, color, linestyle='-'):
     Plots a inverse cumulative distribution of 'data' on the axes 'ax'. The line
     is plotted in the provided 'color' with the provided 'linestyle'.
     """
-    n, bins, patches = ax.hist(data, bins=100, density=True, histtype='step',
-        cumulative=-1, color=color, zorder=10, linewidth=2, linestyle=linestyle)
-    patches[0].set_xy(patches[0].get_xy()[1:])
+    data = np.asarray(data, dtype=np.float64)
+    lo, hi = data.min(), data.max()
+    if fast_histogram is not None:
+        # fast_histogram treats the upper end of the range as exclusive, so
+        # nudge it up to make sure the largest sample lands in the last bin.
+        counts = fast_histogram.histogram1d(data, bins=100,
+            range=(lo, np.nextafter(hi, np.inf)))
+    else:
+        counts, _ = np.histogram(data, bins=100, range=(lo, hi))
+    edges = np.linspace(lo, hi, 101)
+
+    # The fraction of samples at or above the lower edge of each bin. The last
+    # value is repeated so that the final step extends to the right edge, and
+    # the line then drops to 0 at the largest sample.
+    cdf = counts[::-1].cumsum()[::-1]/counts.sum()
+    ax.step(np.append(edges, hi), np.append(cdf, [cdf[-1], 0]), where='post',
+        color=color, zorder=10, linewidth=2, linestyle=linestyle)
 
 def format_cdf(ax):
     """
@@ -210,35 +267,50 @@ def plot_bar_by_loc(ax, expts, yfn, errfn, colorfn, annotatefn, barwidth,
     the horizontal direction. 'xlabelhadjust' refers to the amount the location
     labels should be moved left of center in order for them to appear centered.
     """
-    xpos = np.arange(len(locs))
+    xpos = _XPOS if locs is ORDERED_LOCS else np.arange(len(locs))
 
     if not actual_barwidth: actual_barwidth = barwidth
 
-    for loci, loc in enumerate(locs):
-        maxerr = 0
-
-        for expti, expt in enumerate(expts):
-            x = xpos[loci] + expti*barwidth
-
-            ys = yfn(expt, loc)
-            errs = errfn(expt, loc) if errfn is not None else [None for _ in ys]
-
-            # Plot each y value in ascending order. The first will be solidly
-            # filled, and the remaining will be white with different hatch
-            # fillings.
-            for yi, y in enumerate(ys):
-                color = colorfn(expt) if yi in hatch_fill else 'white'
-                edgecolor = 'black' if yi in hatch_fill else colorfn(expt)
-
-                yerr = errs[yi]
-                if yerr is not None:
-                    err_min, err_max = yerr
-                    yerr = [[y-err_min], [err_max-y]]
-                    if yi != len(ys)-1: lower = err_max
-                    maxerr = max(maxerr, err_max)
-                rect = ax.bar(x, y, actual_barwidth, color=color, edgecolor=edgecolor,
-                    hatch=hatches[yi], zorder=10-yi, yerr=yerr, capsize=errwidth)
+    # Evaluate the callbacks once per experiment (and location) up front, since
+    # each bar and annotation would otherwise call them again.
+    colors = [colorfn(expt) for expt in expts]
+    all_ys = {(expti, loc): yfn(expt, loc) for expti, expt in enumerate(expts)
+        for loc in locs}
+    all_errs = {(expti, loc): errfn(expt, loc) if errfn is not None else
+        [None for _ in all_ys[(expti, loc)]] for expti, expt in enumerate(expts)
+        for loc in locs}
+    # The highest error bar at each location, above which annotations go.
+    maxerrs = np.zeros(len(locs))
+
+    # Plot each experiment's bars for all locations at once, one layer per y
+    # value, in ascending order. The first will be solidly filled, and the
+    # remaining will be white with different hatch fillings.
+    for expti, expt in enumerate(expts):
+        xs = xpos + expti*barwidth
+
+        for yi in range(len(all_ys[(expti, locs[0])])):
+            color = colors[expti] if yi in hatch_fill else 'white'
+            edgecolor = 'black' if yi in hatch_fill else colors[expti]
+
+            heights = np.array([all_ys[(expti, loc)][yi] for loc in locs])
+            errs = [all_errs[(expti, loc)][yi] for loc in locs]
+
+            # Locations without an error bar get NaN so that none is drawn.
+            yerr = None
+            if any(err is not None for err in errs):
+                yerr = np.full((2, len(locs)), np.nan)
+                for loci, err in enumerate(errs):
+                    if err is None: continue
+                    err_min, err_max = err
+                    yerr[0][loci] = heights[loci]-err_min
+                    yerr[1][loci] = err_max-heights[loci]
+                    maxerrs[loci] = max(maxerrs[loci], err_max)
+
+            ax.bar(xs, heights, actual_barwidth, color=color,
+                edgecolor=edgecolor, hatch=hatches[yi], zorder=10-yi, yerr=yerr,
+                capsize=errwidth)
 
+    for loci, loc in enumerate(locs):
         for expti, expt in enumerate(expts):
             # Add annotation at the bottom of the bar if appropriate
             if annotatefn is not None:
@@ -250,18 +322,19 @@ def plot_bar_by_loc(ax, expts, yfn, errfn, colorfn, annotatefn, barwidth,
                     #     va='center', size=annotationsize, zorder=10, color='black', rotation=270)
                     # x = rect[0].get_x()+rect[0].get_width()/2.
                     x = xpos[loci] + expti*barwidth - barwidth/4.
-                    y = maxerr + 4 # adjustment
+                    y = maxerrs[loci] + 4 # adjustment
                     # ax.text(x, y, annotation, ha='left', bbox=dict(facecolor='white', edgecolor=colorfn(expt), boxstyle='round'),
                     #     va='bottom', size=annotationsize, zorder=10, color='black', rotation=45)
                     ax.text(x, y, annotation, ha='left', bbox=dict(facecolor='white', edgecolor='white', pad=0),
-                        va='bottom', size=annotationsize+4, zorder=4, color=colorfn(expt), rotation=annotationangle)
+                        va='bottom', size=annotationsize+4, zorder=4, color=colors[expti], rotation=annotationangle)
 
     # Add labels for locations on the x axis and set font size for y axis
     # labels.
 
     if len(locs) > 1:
         ax.set_xticks(xpos+barwidth*len(expts)/2.-barwidth/2.)
-        ax.set_xticklabels([l.upper() for l in locs], fontsize=fontsize, ha='center')
+        ax.set_xticklabels(ORDERED_LOCS_UPPER if locs is ORDERED_LOCS else
+            [l.upper() for l in locs], fontsize=fontsize, ha='center')
     else: ax.set_xticklabels('')
     ax.tick_params(axis='x', length=0)
     ax.tick_params(axis='y', labelsize=fontsize)
@@ -287,22 +360,24 @@ def conflict_annotation(expt, loc):
 
     return None
 
-def reproduction_bar(dirname):
+def reproduction_bar(dirname, results=None):
     """
     Generates a graph that reproduces the results of the original EPaxos paper,
     comparing commit and execution latencies, with conflict rate. 'dirname' is a
     directory containing experiments for EPaxos 0%, EPaxos 2%, EPaxos 100%,
     EPaxos Zipf, and MPaxos. The generated graph is saved as an image in the
-    directory specified by 'dirname'.
+    directory specified by 'dirname'. 'results' optionally provides the already
+    loaded Results objects for 'dirname' so that they aren't parsed again.
     """
     plt.clf()
 
-    results = get_results(dirname)
-    epaxos_0 = get_fixed_epaxos_result(results, 0)
-    epaxos_2 = get_fixed_epaxos_result(results, 2)
-    epaxos_100 = get_fixed_epaxos_result(results, 100)
-    epaxos_zipf = get_epaxos_zipf_result(results)
-    mpaxos = get_mpaxos_result(results)
+    if results is None: results = get_results(dirname)
+    table = classify_results(results)
+    epaxos_0 = get_fixed_epaxos_result(table, 0)
+    epaxos_2 = get_fixed_epaxos_result(table, 2)
+    epaxos_100 = get_fixed_epaxos_result(table, 100)
+    epaxos_zipf = get_epaxos_zipf_result(table)
+    mpaxos = get_mpaxos_result(table)
     expts = [epaxos_0, epaxos_2, epaxos_100, epaxos_zipf, mpaxos]
 
     fig, axs = plt.subplots(2, 1, figsize=(13, 6), constrained_layout=True)
@@ -358,23 +433,25 @@ def reproduction_bar(dirname):
         ['Commit', 'Exec'], ncol=2, loc='upper right', size=fontsize)
     axs[0].add_artist(leg)
 
-    plt.savefig(path.join(dirname, 'reproduction_bar.pdf'))
+    plt.savefig(path.join(dirname, 'reproduction_bar.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
-def batching_bar(dirname):
+def batching_bar(dirname, results=None):
     """
     Generates a graph that compares the execution latency between EPaxos with
     batching, EPaxos without batching, and MPaxos. 'dirname' is a directory
     containing those three experiments. The generated graph is saved as an image
-    in the directory specified by 'dirname'.
+    in the directory specified by 'dirname'. 'results' optionally provides the
+    already loaded Results objects for 'dirname'.
     """
     plt.clf()
 
-    results = get_results(dirname)
+    if results is None: results = get_results(dirname)
     batching = list(filter(lambda r: r.is_epaxos() and r.batching_enabled(),
         results))
     no_batching = list(filter(lambda r: r.is_epaxos() and not r.batching_enabled(),
         results))
-    mpaxos = get_mpaxos_result(results)
+    mpaxos = get_mpaxos_result(classify_results(results))
     expts = [batching, no_batching, mpaxos]
 
     fig, ax = plt.subplots(figsize=(13, 4), constrained_layout=True)
@@ -407,7 +484,8 @@ def batching_bar(dirname):
         loc='lower right', size=fontsize, squeeze=True)
     leg.set_zorder(20)
 
-    plt.savefig(path.join(dirname, 'batching_bar.pdf'))
+    plt.savefig(path.join(dirname, 'batching_bar.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
 def base_latency(expt, loc):
     if isinstance(expt, list): expt = expt[0]
@@ -446,13 +524,14 @@ def base_latency(expt, loc):
             'eu': 201,
         }[loc]
 
-def osc_bar(dirname):
+def osc_bar(dirname, results=None):
     """
     TODO(sktollman): add comment
     """
     plt.clf()
 
-    results = get_results(dirname)
+    if results is None: results = get_results(dirname)
+    table = classify_results(results)
 
     workloads = [
         (.8, .5),
@@ -491,7 +570,7 @@ def osc_bar(dirname):
         cluster = list(filter(lambda r: r.is_epaxos() and r.clock_sync_str() == CLOCK_SYNC_CLUSTER and \
             r.frac_writes() == writes and r.theta() == theta,
             results))
-        mpaxos = get_mpaxos_result(results)
+        mpaxos = get_mpaxos_result(table)
         expts = [*[cluster, quorum_union, quorum, none][::-1], mpaxos]
 
         # for loc in ORDERED_LOCS:
@@ -548,9 +627,10 @@ def osc_bar(dirname):
         ['Minimum', 'Mean Exec', 'P99 Exec'], ncol=2, loc='upper right')
     axs[0].add_artist(leg)
 
-    plt.savefig(path.join(dirname, 'osc_bar.pdf'))
+    plt.savefig(path.join(dirname, 'osc_bar.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
-def osc_bar_loc(dirname):
+def osc_bar_loc(dirname, results=None):
     """
     TODO
     """
@@ -558,7 +638,8 @@ def osc_bar_loc(dirname):
 
     plt.clf()
 
-    results = get_results(dirname)
+    if results is None: results = get_results(dirname)
+    table = classify_results(results)
 
     workloads = [
         # (.8, .5),
@@ -597,7 +678,7 @@ def osc_bar_loc(dirname):
         cluster = list(filter(lambda r: r.is_epaxos() and r.clock_sync_str() == CLOCK_SYNC_CLUSTER and \
             r.frac_writes() == writes and r.theta() == theta,
             results))
-        mpaxos = get_mpaxos_result(results)
+        mpaxos = get_mpaxos_result(table)
         expts = [none, quorum, quorum_union, cluster, mpaxos]
 
         # Plots mean latency as a bar and 99th percentile latency as an error bar
@@ -642,7 +723,8 @@ def osc_bar_loc(dirname):
         fontsize=fontsize, ha='right', rotation=35)
     # ax.add_artist(leg)
 
-    plt.savefig(path.join(dirname, 'osc_bar_{}.pdf'.format(loc)))
+    plt.savefig(path.join(dirname, 'osc_bar_{}.{}'.format(loc, FIG_EXT)))
+    plt.close(fig)
 
 def conflict_range_annotation(es, loc):
     if es[0].is_mpaxos(): return ''
@@ -675,13 +757,13 @@ def conflict_stdev_annotation(es, loc):
         return '{}%'.format(mean)
     return '{}% (±{}%)'.format(mean, stdev)
 
-def thrifty_bar(dirname):
+def thrifty_bar(dirname, results=None):
     """
     TODO
     """
     plt.clf()
 
-    results = get_results(dirname)
+    if results is None: results = get_results(dirname)
     thrifty = list(filter(lambda r: r.is_epaxos() and r.thrifty(),
         results))
     no_thrifty = list(filter(lambda r: r.is_epaxos() and not r.thrifty(),
@@ -786,7 +868,8 @@ def thrifty_bar(dirname):
         ['Thrifty', 'No Thrifty'], ncol=3,
         loc='upper right', size=fontsize)
 
-    plt.savefig(path.join(dirname, 'thrifty_bar.pdf'))
+    plt.savefig(path.join(dirname, 'thrifty_bar.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
     with open(path.join(dirname, 'thrifty_stats.txt'), 'w') as f:
         print(tabulate(rows, headers=[
@@ -794,7 +877,7 @@ def thrifty_bar(dirname):
             'Conflict Stdev', 'Mean Lat Avg', 'Mean Lat Stdev', 'P99 Lat Avg',
             'P99 Lat Stdev'], tablefmt='github'), file=f)
 
-def commitvexec_cdf(dirname, loc='or'):
+def commitvexec_cdf(dirname, loc='or', results=None):
     """
     Generates a CDF graph that compares the commit and execution latency of
     EPaxos. The graph contains arrows indicating that the fast path is 1 RTT,
@@ -804,20 +887,23 @@ def commitvexec_cdf(dirname, loc='or'):
     workload. The generated graph is saved as an image in the directory
     specified by 'dirname'. 'loc' specifies which client location's latency
     should be plotted; all client locations will show the same patterns, so we
-    only plot one.
+    only plot one. 'results' optionally provides the already loaded Results
+    objects for 'dirname'.
     """
     plt.clf()
 
-    results = get_results(dirname)
-    expt = get_epaxos_zipf_result(results)[0]
-    mpaxos = get_mpaxos_result(results)[0]
+    if results is None: results = get_results(dirname)
+    table = classify_results(results)
+    expt = get_epaxos_zipf_result(table)[0]
+    mpaxos = get_mpaxos_result(table)[0]
 
     fig, ax = plt.subplots(figsize=(7, 4), constrained_layout=True)
 
     # Add CDF lines for commit and exec latency.
+    exec_lats = expt.all_lats_exec(loc)
     plot_cdf(ax, mpaxos.all_lats_exec(loc), get_color(mpaxos))
     plot_cdf(ax, expt.all_lats_commit(loc), ALTERNATE_ZIPF_COLOR, '--')
-    plot_cdf(ax, expt.all_lats_exec(loc), get_color(expt))
+    plot_cdf(ax, exec_lats, get_color(expt))
 
     # Add arrows highlighting key latencies.
     make_arrow = lambda text, x: ax.annotate(text, xy=(x, 1), xytext=(x, 10),
@@ -825,11 +911,11 @@ def commitvexec_cdf(dirname, loc='or'):
         verticalalignment='top', horizontalalignment='center')
     make_arrow('1 RTT', expt.p50_lat_exec(loc))
     make_arrow('2 RTTs', expt.p99_lat_commit(loc))
-    make_arrow('Bound', sorted(expt.all_lats_exec(loc))[-1])
+    make_arrow('Bound', exec_lats.max())
 
     print('1 RTT', expt.p50_lat_exec(loc))
     print('2 RTTs', expt.p99_lat_commit(loc))
-    print('Bound', sorted(expt.all_lats_exec(loc))[-1])
+    print('Bound', exec_lats.max())
     print('MPaxos', mpaxos.p50_lat_exec(loc))
 
     format_cdf(ax)
@@ -844,9 +930,10 @@ def commitvexec_cdf(dirname, loc='or'):
     ax.set_ylabel('% Operations', fontsize=20)
     ax.tick_params(axis='both', labelsize=18)
 
-    plt.savefig(path.join(dirname, 'commitvexec_cdf_{}.pdf'.format(loc)))
+    plt.savefig(path.join(dirname, 'commitvexec_cdf_{}.{}'.format(loc, FIG_EXT)))
+    plt.close(fig)
 
-def infinite_cdf(dirname, loc='or'):
+def infinite_cdf(dirname, loc='or', results=None):
     """
     Generates a CDF graph that compares the execution latency of EPaxos with and
     without a modification that bounds execution delay. 'dirname' is a directory
@@ -854,17 +941,17 @@ def infinite_cdf(dirname, loc='or'):
     and one without. The generated graph is saved as an image in the directory
     specified by 'dirname'. 'loc' specifies which client location's latency
     should be plotted; all client locations will show the same patterns, so we
-    only plot one.
+    only plot one. 'results' optionally provides the already loaded Results
+    objects for 'dirname'.
     """
     plt.clf()
 
     fontsize = 24
 
-    results = get_results(dirname)
-    inffix = list(filter(lambda r: is_epaxos_zipf_result(r) and r.inffix(),
-        results))[0]
-    no_inffixs = list(filter(lambda r: is_epaxos_zipf_result(r) and not r.inffix(),
-        results))
+    if results is None: results = get_results(dirname)
+    zipf = get_epaxos_zipf_result(classify_results(results))
+    inffix = list(filter(lambda r: r.inffix(), zipf))[0]
+    no_inffixs = list(filter(lambda r: not r.inffix(), zipf))
 
     for no_inffix in no_inffixs:
         fig, ax = plt.subplots(figsize=(6, 4), constrained_layout=True)
@@ -885,9 +972,10 @@ def infinite_cdf(dirname, loc='or'):
         ax.set_xticks([0, 500, 1000, 1500, 2000, 2500])
         ax.tick_params(axis='both', labelsize=fontsize)
 
-        plt.savefig(path.join(dirname, 'infinite_cdf_{}_{}.pdf'.format(loc, no_inffix.arrival_rate())))
+        plt.savefig(path.join(dirname, 'infinite_cdf_{}_{}.{}'.format(loc, no_inffix.arrival_rate(), FIG_EXT)))
+        plt.close(fig)
 
-def or_vs_psn_cdf(dirname, loc='or'):
+def or_vs_psn_cdf(dirname, loc='or', results=None):
     """
     Generates a CDF graph that compares the execution latency of EPaxos with and
     without a modification that bounds execution delay. 'dirname' is a directory
@@ -895,17 +983,19 @@ def or_vs_psn_cdf(dirname, loc='or'):
     and one without. The generated graph is saved as an image in the directory
     specified by 'dirname'. 'loc' specifies which client location's latency
     should be plotted; all client locations will show the same patterns, so we
-    only plot one.
+    only plot one. 'results' optionally provides the already loaded Results
+    objects for 'dirname'.
     """
     plt.clf()
 
     fontsize = 24
 
-    results = get_results(dirname)
-    psn = list(filter(lambda r: is_epaxos_zipf_result(r) and isinstance(r.arrival_rate(), Experiment.PoissonArrivalRate),
-        results))[0]
-    ors = list(filter(lambda r: is_epaxos_zipf_result(r) and isinstance(r.arrival_rate(), Experiment.OutstandingReqArrivalRate),
-        results))
+    if results is None: results = get_results(dirname)
+    zipf = get_epaxos_zipf_result(classify_results(results))
+    psn = list(filter(lambda r: isinstance(r.arrival_rate(), Experiment.PoissonArrivalRate),
+        zipf))[0]
+    ors = list(filter(lambda r: isinstance(r.arrival_rate(), Experiment.OutstandingReqArrivalRate),
+        zipf))
 
     for oreq in ors:
         fig, ax = plt.subplots(figsize=(6, 4), constrained_layout=True)
@@ -927,31 +1017,33 @@ def or_vs_psn_cdf(dirname, loc='or'):
         ax.set_xticks([0, 500, 1000, 1500])
         ax.tick_params(axis='both', labelsize=fontsize)
 
-        plt.savefig(path.join(dirname, 'or_vs_psn_cdf_{}_{}.pdf'.format(loc, oreq.arrival_rate())))
+        plt.savefig(path.join(dirname, 'or_vs_psn_cdf_{}_{}.{}'.format(loc, oreq.arrival_rate(), FIG_EXT)))
+        plt.close(fig)
 
-def infinite_bar_old(dirname):
+def infinite_bar_old(dirname, results=None):
     """
     Generates a bar graph that compares the execution latency of EPaxos with and
     without a modification that bounds execution delay. 'dirname' is a directory
     containing two EPaxos experiments with Zipfian workload, one with the fix
     and one without, as well as a Multi-Paxos experiment and EPaxos 0%
     experiment for comparison. The generated graph is saved as an image in the
-    directory specified by 'dirname'.
+    directory specified by 'dirname'. 'results' optionally provides the already
+    loaded Results objects for 'dirname'.
     """
     plt.clf()
 
-    results = get_results(dirname)
-    inffix = list(filter(lambda r: is_epaxos_zipf_result(r) and r.inffix(),
-        results))
-    no_inffix = list(filter(lambda r: is_epaxos_zipf_result(r) \
-        and not r.inffix(), results))
-    epaxos_0 = get_fixed_epaxos_result(results, 0)
-    mpaxos = get_mpaxos_result(results)
+    if results is None: results = get_results(dirname)
+    table = classify_results(results)
+    zipf = get_epaxos_zipf_result(table)
+    inffix = list(filter(lambda r: r.inffix(), zipf))
+    no_inffix = list(filter(lambda r: not r.inffix(), zipf))
+    epaxos_0 = get_fixed_epaxos_result(table, 0)
+    mpaxos = get_mpaxos_result(table)
     expts = [epaxos_0, inffix, mpaxos]
 
     for e in no_inffix:
         for l in ORDERED_LOCS:
-            print(l, max(e.all_lats_exec(l)))
+            print(l, e.all_lats_exec(l).max())
         print()
 
     fig, ax = plt.subplots(1, 1, figsize=(8, 4), constrained_layout=True)
@@ -987,7 +1079,8 @@ def infinite_bar_old(dirname):
         ['Improved', 'Unmodified'], ncol=2, loc='upper right')
     ax.add_artist(leg)
 
-    plt.savefig(path.join(dirname, 'infinite_bar_mean.pdf'))
+    plt.savefig(path.join(dirname, 'infinite_bar_mean.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
 
     fig, ax = plt.subplots(1, 1, figsize=(8, 4), constrained_layout=True)
@@ -1014,26 +1107,28 @@ def infinite_bar_old(dirname):
         errwidth=7)
     ax.set_ylabel('P99 Latency (ms)', fontsize=fontsize)
 
-    plt.savefig(path.join(dirname, 'infinite_bar_p99.pdf'))
+    plt.savefig(path.join(dirname, 'infinite_bar_p99.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
-def infinite_bar(dirname):
+def infinite_bar(dirname, results=None):
     """
     Generates a bar graph that compares the execution latency of EPaxos with and
     without a modification that bounds execution delay. 'dirname' is a directory
     containing two EPaxos experiments with Zipfian workload, one with the fix
     and one without, as well as a Multi-Paxos experiment and EPaxos 0%
     experiment for comparison. The generated graph is saved as an image in the
-    directory specified by 'dirname'.
+    directory specified by 'dirname'. 'results' optionally provides the already
+    loaded Results objects for 'dirname'.
     """
     plt.clf()
 
-    results = get_results(dirname)
-    inffix = list(filter(lambda r: is_epaxos_zipf_result(r) and r.inffix(),
-        results))
-    no_inffix = list(filter(lambda r: is_epaxos_zipf_result(r) \
-        and not r.inffix(), results))
-    epaxos_0 = get_fixed_epaxos_result(results, 0)
-    mpaxos = get_mpaxos_result(results)
+    if results is None: results = get_results(dirname)
+    table = classify_results(results)
+    zipf = get_epaxos_zipf_result(table)
+    inffix = list(filter(lambda r: r.inffix(), zipf))
+    no_inffix = list(filter(lambda r: not r.inffix(), zipf))
+    epaxos_0 = get_fixed_epaxos_result(table, 0)
+    mpaxos = get_mpaxos_result(table)
     expts = [no_inffix, inffix, mpaxos]
 
     # for e in no_inffix:
@@ -1076,7 +1171,8 @@ def infinite_bar(dirname):
     #     ['Improved', 'Unmodified'], ncol=2, loc='upper right')
     # ax.add_artist(leg)
 
-    plt.savefig(path.join(dirname, 'infinite_bar_mean.pdf'))
+    plt.savefig(path.join(dirname, 'infinite_bar_mean.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
 
     fig, ax = plt.subplots(1, 1, figsize=(8, 4), constrained_layout=True)
@@ -1103,15 +1199,16 @@ def infinite_bar(dirname):
         errwidth=7)
     ax.set_ylabel('P99 Latency (ms)', fontsize=fontsize)
 
-    plt.savefig(path.join(dirname, 'infinite_bar_p99.pdf'))
+    plt.savefig(path.join(dirname, 'infinite_bar_p99.{}'.format(FIG_EXT)))
+    plt.close(fig)
 
-def client_metrics_over_time(dirname, loc='or'):
+def client_metrics_over_time(dirname, loc='or', results=None):
     plt.clf()
 
-    results = get_results(dirname)
-    expt = get_epaxos_zipf_result(results)[0]
-    no_inffix = list(filter(lambda r: is_epaxos_zipf_result(r) and not r.inffix(),
-        results))
+    if results is None: results = get_results(dirname)
+    zipf = get_epaxos_zipf_result(classify_results(results))
+    expt = zipf[0]
+    no_inffix = list(filter(lambda r: not r.inffix(), zipf))
     for i, expt in enumerate(results):#enumerate(no_inffix):
         fig, ax = plt.subplots(figsize=(5, 3), constrained_layout=True)
 
@@ -1130,17 +1227,31 @@ def client_metrics_over_time(dirname, loc='or'):
 
         ax.grid()
 
-        plt.savefig(path.join(dirname, 'client_metrics_over_time_{}_{}.pdf'.format(loc, expt.arrival_rate())))
+        plt.savefig(path.join(dirname, 'client_metrics_over_time_{}_{}.{}'.format(loc, expt.arrival_rate(), FIG_EXT)))
+        plt.close(fig)
 
 if __name__ == '__main__':
     """
-    Plots graphs for experiments that have already been run.
+    Plots graphs for experiments that have already been run. Directories that
+    are plotted more than once are only loaded once. The graphs are independent
+    of one another, so each is generated in its own process; pyplot's global
+    state rules out using threads instead.
     """
-    reproduction_bar('results/reproduction')
-    batching_bar('results/batching')
-    commitvexec_cdf('results/commitvexec')
-    thrifty_bar('results/thrifty')
-    osc_bar('results/osc')
-    osc_bar_loc('results/osc')
-    client_metrics_over_time('results/commitvexec')
-
+    commitvexec_results = get_results('results/commitvexec')
+    osc_results = get_results('results/osc')
+
+    with ProcessPoolExecutor() as executor:
+        futures = [
+            executor.submit(reproduction_bar, 'results/reproduction'),
+            executor.submit(batching_bar, 'results/batching'),
+            executor.submit(commitvexec_cdf, 'results/commitvexec',
+                results=commitvexec_results),
+            executor.submit(thrifty_bar, 'results/thrifty'),
+            executor.submit(osc_bar, 'results/osc', results=osc_results),
+            executor.submit(osc_bar_loc, 'results/osc', results=osc_results),
+            executor.submit(client_metrics_over_time, 'results/commitvexec',
+                results=commitvexec_results),
+        ]
+        # Surface any exception raised while generating a graph.
+        for future in futures:
+            future.result()
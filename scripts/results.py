@@ -19,6 +19,7 @@ TODO
 """
 
 import json
+import numpy as np
 from os import path
 
 from experiment import Experiment
@@ -86,9 +87,11 @@ class Results(Experiment):
                 if commit_lat > 0:
                     commit_lats.append(commit_lat)
 
-            self._all_lats_timestamps[loc] = timestamps
-            self._all_lats_commit[loc] = commit_lats
-            self._all_lats_exec[loc] = exec_lats
+            # Store the samples as packed arrays so that callers can reduce and
+            # plot them without converting the lists again on every use.
+            self._all_lats_timestamps[loc] = np.array(timestamps, dtype=np.int64)
+            self._all_lats_commit[loc] = np.array(commit_lats, dtype=np.float64)
+            self._all_lats_exec[loc] = np.array(exec_lats, dtype=np.float64)
 
     def all_lats_timestamps(self, loc):
         if not loc in self._all_lats_timestamps: